@@ -1,19 +1,35 @@
 import enum
-import functools
-import io
 import itertools
 import random
+import sys
 
 RANKS = ["2", "3", "4", "5", "6", "7", "8", "9", "X", "J", "Q", "K", "A"]
 SUITS = ["H", "C", "D", "S"]
-ALL_CARDS = [f"{rank}{suit}" for rank in RANKS for suit in SUITS] * 2 + ["JJ"]
-ONE_EYEDS = ["JS", "JH"]
-TWO_EYEDS = ["JC", "JD"]
+# Interning the card names lets the many equality and membership checks
+# on cards short-circuit on identity.
+ALL_CARDS = [sys.intern(f"{rank}{suit}") for rank in RANKS for suit in SUITS] * 2 + [
+    "JJ"
+]
+ONE_EYEDS = frozenset(["JS", "JH"])
+TWO_EYEDS = frozenset(["JC", "JD"])
 
 
 CORN = object()
 
 
+class CardClass(enum.Enum):
+    NORMAL = enum.auto()
+    ONE_EYED = enum.auto()
+    TWO_EYED = enum.auto()
+    JOKER = enum.auto()
+
+
+CARD_CLASSES = {card: CardClass.NORMAL for card in ALL_CARDS}
+CARD_CLASSES.update({card: CardClass.ONE_EYED for card in ONE_EYEDS})
+CARD_CLASSES.update({card: CardClass.TWO_EYED for card in TWO_EYEDS})
+CARD_CLASSES["JJ"] = CardClass.JOKER
+
+
 class IllegalMove(Exception):
     pass
 
@@ -22,20 +38,24 @@ class GameSetupError(Exception):
     pass
 
 
-def pretty_card(card):
-    if card is CORN:
-        return "Corner"
-    if card == "JJ":
-        return "Joker"
-    else:
-        card_suit = {
-            "H": "♥",
-            "C": "♣",
-            "D": "♦",
-            "S": "♠",
-        }[card[-1]]
-        card_rank = "10" if card[0] == "X" else card[0]
-        return card_rank + card_suit
+SUIT_GLYPHS = {
+    "H": "♥",
+    "C": "♣",
+    "D": "♦",
+    "S": "♠",
+}
+
+PRETTY_CARDS = {
+    card: ("10" if card[0] == "X" else card[0]) + SUIT_GLYPHS[card[-1]]
+    for card in set(ALL_CARDS) - {"JJ"}
+}
+PRETTY_CARDS["JJ"] = "Joker"
+PRETTY_CARDS[CORN] = "Corner"
+
+
+# Every card (and CORN) is in the table, so the lookup itself is the
+# function; binding it directly skips a wrapper frame per call.
+pretty_card = PRETTY_CARDS.__getitem__
 
 
 def unique_cards_by_action(cards):
@@ -47,20 +67,27 @@ def unique_cards_by_action(cards):
     return cards
 
 
-def sort_hand(hand):
-    return sorted(
-        hand,
-        key=lambda card: (
-            card == "JJ",
-            card in TWO_EYEDS,
-            card in ONE_EYEDS,
-            "HCDS".find(card[1]),
-            "23456789XQKA".find(card[0]),
-        ),
+# Precomputed sort key per card, replacing the per-card membership and
+# str.find probing that used to run on every sort.
+SORT_KEYS = {
+    card: (
+        card == "JJ",
+        card in TWO_EYEDS,
+        card in ONE_EYEDS,
+        "HCDS".find(card[1]),
+        "23456789XQKA".find(card[0]),
     )
+    for card in set(ALL_CARDS)
+}
 
 
-class MoveType(enum.Enum):
+def sort_hand(hand):
+    return sorted(hand, key=SORT_KEYS.__getitem__)
+
+
+class MoveType(enum.IntEnum):
+    # IntEnum so the equality checks in the move-dispatch and weighting
+    # hot paths are plain int compares.
     PLACE_CHIP = enum.auto()
     REMOVE_CHIP = enum.auto()
     DISCARD_DEAD_CARD = enum.auto()
@@ -84,115 +111,161 @@ def describe_move(move, board) -> str:
     raise TypeError(f"Invalid move type {action!r}")
 
 
+COORD_CLOSENESS_TO_CENTER = (1, 2, 3, 4, 5, 5, 4, 3, 2, 1)
+
+
 def coord_closeness_to_center(val):
-    if val in (4, 5):
-        return 5
-    if val in (3, 6):
-        return 4
-    if val in (2, 7):
-        return 3
-    if val in (1, 8):
-        return 2
-    return 1
+    return COORD_CLOSENESS_TO_CENTER[val]
+
+
+# Position weights are pure geometry; table them once instead of
+# unpacking and re-deriving the min per candidate move.
+CENTERMOST_WEIGHTS = {
+    (row, col): min(COORD_CLOSENESS_TO_CENTER[row], COORD_CLOSENESS_TO_CENTER[col])
+    for row in range(10)
+    for col in range(10)
+}
 
 
 def move_weight_centermost(move):
     card, move_type, pos = move
     if move_type == MoveType.DISCARD_DEAD_CARD:
-        if card in ONE_EYEDS:
+        if CARD_CLASSES[card] is CardClass.ONE_EYED:
             return 0
         return 9999
-    pos_x, pos_y = pos
-    return min(coord_closeness_to_center(pos_x), coord_closeness_to_center(pos_y))
+    return CENTERMOST_WEIGHTS[pos]
+
+
+# These sequence generators only ever run at import time, to build the
+# precomputed tables below.
+def _hrsequence(row, column):
+    return frozenset((row, c) for c in range(column, column + 5))
+
 
+def _vdsequence(row, column):
+    return frozenset((r, column) for r in range(row, row + 5))
 
-def sequence_gen_restrict(row_restrict, col_restrict):
-    def dec(func):
-        @functools.wraps(func)
-        def wrapper(pos):
-            row, col = pos
-            assert row in row_restrict
-            assert col in col_restrict
-            return func(row, col)
 
-        def iter_inputs():
-            for row in row_restrict:
-                for col in col_restrict:
-                    yield (row, col)
+def _ddsequence(row, column):
+    return frozenset((row + n, column + n) for n in range(5))
 
-        wrapper.iter_inputs = iter_inputs
-        return wrapper
 
-    return dec
+def _dusequence(row, column):
+    return frozenset((row - n, column + n) for n in range(5))
 
 
-@sequence_gen_restrict(range(10), range(6))
-def hrsequence(row, column):
-    return {(row, c) for c in range(column, column + 5)}
+def _gen_all_sequences():
+    for func, row_restrict, col_restrict in [
+        (_hrsequence, range(10), range(6)),
+        (_vdsequence, range(6), range(10)),
+        (_ddsequence, range(6), range(6)),
+        (_dusequence, range(4, 10), range(6)),
+    ]:
+        for row in row_restrict:
+            for col in col_restrict:
+                yield func(row, col)
 
 
-@sequence_gen_restrict(range(6), range(10))
-def vdsequence(row, column):
-    return {(r, column) for r in range(row, row + 5)}
+def _gen_corner_sequences():
+    # Top left
+    yield _hrsequence(0, 0)
+    yield _vdsequence(0, 0)
+    yield _ddsequence(0, 0)
+
+    # Top right
+    yield _hrsequence(0, 5)
+    yield _vdsequence(0, 9)
+    yield _dusequence(4, 5)
+
+    # Bottom left
+    yield _hrsequence(9, 0)
+    yield _vdsequence(5, 0)
+    yield _dusequence(9, 0)
+
+    # Bottom right
+    yield _hrsequence(9, 5)
+    yield _vdsequence(5, 9)
+    yield _ddsequence(5, 5)
 
 
-@sequence_gen_restrict(range(6), range(6))
-def ddsequence(row, column):
-    return {(row + n, column + n) for n in range(5)}
+ALL_POS = tuple((row, col) for row in range(10) for col in range(10))
 
 
-@sequence_gen_restrict(range(4, 10), range(6))
-def dusequence(row, column):
-    return {(row - n, column + n) for n in range(5)}
+def iter_pos():
+    return iter(ALL_POS)
+
+
+# Sequences never change, so materialize them once at import time rather
+# than re-running the generators (and re-allocating their sets) on every
+# board scan.
+ALL_SEQUENCES = tuple(_gen_all_sequences())
+CORNER_SEQUENCES = tuple(_gen_corner_sequences())
+CORNER_EXTENSIONS = frozenset(
+    seq
+    for seq in ALL_SEQUENCES
+    if any(len(seq & cseq) == 4 for cseq in CORNER_SEQUENCES)
+)
+NON_EXTENSION_SEQUENCES = tuple(
+    seq for seq in ALL_SEQUENCES if seq not in CORNER_EXTENSIONS
+)
+SEQUENCES_BY_POSITION = {
+    pos: tuple(seq for seq in ALL_SEQUENCES if pos in seq) for pos in iter_pos()
+}
+NON_EXTENSION_SEQUENCES_BY_POSITION = {
+    pos: tuple(seq for seq in seqs if seq not in CORNER_EXTENSIONS)
+    for pos, seqs in SEQUENCES_BY_POSITION.items()
+}
 
 
 def iter_all_sequences():
-    for func in [hrsequence, vdsequence, ddsequence, dusequence]:
-        for pos in func.iter_inputs():
-            yield func(pos)
+    return iter(ALL_SEQUENCES)
 
 
 def iter_corner_sequences():
-    # Top left
-    yield hrsequence((0, 0))
-    yield vdsequence((0, 0))
-    yield ddsequence((0, 0))
+    return iter(CORNER_SEQUENCES)
 
-    # Top right
-    yield hrsequence((0, 5))
-    yield vdsequence((0, 9))
-    yield dusequence((4, 5))
 
-    # Bottom left
-    yield hrsequence((9, 0))
-    yield vdsequence((5, 0))
-    yield dusequence((9, 0))
+def pos_bit(pos):
+    """Get the bitboard bit for a position."""
+    row, column = pos
+    return 1 << (row * 10 + column)
 
-    # Bottom right
-    yield hrsequence((9, 5))
-    yield vdsequence((5, 9))
-    yield ddsequence((5, 5))
 
+def popcount(bitboard):
+    """Count the set bits of a bitboard."""
+    return bin(bitboard).count("1")
+
+
+def iter_bit_positions(bitboard):
+    """Iterate thru the positions of the set bits of a bitboard."""
+    while bitboard:
+        bit = bitboard & -bitboard
+        idx = bit.bit_length() - 1
+        yield (idx // 10, idx % 10)
+        bitboard ^= bit
 
-def iter_pos():
-    for row in range(10):
-        for col in range(10):
-            yield (row, col)
+
+CORN_BITS = sum(pos_bit(pos) for pos in [(0, 0), (0, 9), (9, 0), (9, 9)])
+SEQUENCE_BITS = {seq: sum(pos_bit(pos) for pos in seq) for seq in ALL_SEQUENCES}
+# Corner positions never hold a chip, so mask them out of each sequence
+# once at import rather than on every board scan.
+SEQUENCE_CHIP_BITS = {seq: bits & ~CORN_BITS for seq, bits in SEQUENCE_BITS.items()}
 
 
 class Chip:
-    def __init__(self, team):
-        self.team = team
-        self._flipped = False
+    """A read-only view of one cell of the board's bitboards."""
 
-    def flip(self):
-        assert not self._flipped
-        self._flipped = True
+    def __init__(self, team, flipped=False):
+        self.team = team
+        self._flipped = flipped
 
     def is_flipped(self):
         return self._flipped
 
 
+BOARD_HEADER = "   " + "".join(f"{col}  " for col in range(10)) + "\n"
+
+
 class Board:
     positions = [
         [CORN, "6D", "7D", "8D", "9D", "XD", "QD", "KD", "AD", CORN],
@@ -207,44 +280,116 @@ class Board:
         [CORN, "9S", "8S", "7S", "6S", "5S", "4S", "3S", "2S", CORN],
     ]
 
+    # Flattened copy of the grid with the card strings interned, so a
+    # position lookup is one index and card compares against the deck's
+    # (also interned) names are pointer compares.
+    _positions_flat = tuple(
+        sys.intern(card) if isinstance(card, str) else card
+        for row in positions
+        for card in row
+    )
+
+    # Bound on entries in the per-board move/sequence caches before
+    # they get dumped wholesale.
+    CACHE_LIMIT = 4096
+
     def __init__(self, teams):
-        self.chips = [[None] * 10 for _ in range(10)]
         self.teams = teams
+        self._team_chips = {team: 0 for team in teams}
+        self._occupied = 0
+        self._flipped = 0
+        self._move_cache = {}
+        self._seq_cache = {}
+        self._win_cache = {}
+        # There are only two distinct chip views per team, so intern
+        # them rather than allocating one per getpos call.
+        self._chip_views = {
+            (team, flipped): Chip(team, flipped=flipped)
+            for team in teams
+            for flipped in (False, True)
+        }
+
+    def _state_key(self):
+        """Get a hashable key identifying the current board state.
+
+        The bitboards are the entire mutable state, so they make an
+        exact cache key: any mutation produces a different key, and
+        stale entries simply stop being hit.
+        """
+        return (self._flipped, *self._team_chips.values())
+
+    def occupied(self):
+        """Get a bitboard of all positions with a chip."""
+        return self._occupied
+
+    def team_chips(self, team):
+        """Get the bitboard of a team's chips."""
+        return self._team_chips[team]
+
+    def flipped_chips(self):
+        """Get the bitboard of chips which are in a sequence."""
+        return self._flipped
 
     def getpos(self, pos):
         """Get a 2-tuple of (card, chip) for a given position."""
         row, column = pos
         assert 0 <= row < 10
         assert 0 <= column < 10
-        return (self.positions[row][column], self.chips[row][column])
+        idx = row * 10 + column
+        bit = 1 << idx
+        chip = None
+        for team, chips in self._team_chips.items():
+            if chips & bit:
+                chip = self._chip_views[team, bool(self._flipped & bit)]
+                break
+        return (self._positions_flat[idx], chip)
 
     def iter_moves(self, card, team):
-        card_is_dead = True
-
-        if card in ONE_EYEDS or card == "JJ":
-            for pos in iter_pos():
-                _, chip = self.getpos(pos)
-                if not chip:
-                    continue
-                if chip.team is not team and not chip.is_flipped():
-                    card_is_dead = False
-                    yield (card, MoveType.REMOVE_CHIP, pos)
-
-        if card not in ONE_EYEDS:
-            for pos in iter_pos():
-                pos_card, chip = self.getpos(pos)
-                if chip or pos_card is CORN:
-                    continue
-                if pos_card == card or card in TWO_EYEDS or card == "JJ":
-                    card_is_dead = False
-                    yield (card, MoveType.PLACE_CHIP, pos)
+        key = (card, team, self._state_key())
+        moves = self._move_cache.get(key)
+        if moves is None:
+            if len(self._move_cache) >= self.CACHE_LIMIT:
+                self._move_cache.clear()
+            moves = tuple(self._build_moves(card, team))
+            self._move_cache[key] = moves
+        return moves
+
+    def _build_moves(self, card, team):
+        moves = []
+        append = moves.append
+        card_class = CARD_CLASSES[card]
+
+        if card_class in (CardClass.ONE_EYED, CardClass.JOKER):
+            removable = (self._occupied & ~self._team_chips[team]) & ~self._flipped
+            for pos in iter_bit_positions(removable):
+                append((card, MoveType.REMOVE_CHIP, pos))
+
+        if card_class is not CardClass.ONE_EYED:
+            if card_class is not CardClass.NORMAL:
+                for pos in iter_bit_positions(PLAYABLE_BITS & ~self._occupied):
+                    append((card, MoveType.PLACE_CHIP, pos))
+            else:
+                for pos in CARD_POSITIONS[card]:
+                    if not self._occupied & pos_bit(pos):
+                        append((card, MoveType.PLACE_CHIP, pos))
 
-        if card_is_dead:
-            yield (card, MoveType.DISCARD_DEAD_CARD, None)
+        if not moves:
+            append((card, MoveType.DISCARD_DEAD_CARD, None))
+        return moves
 
     def card_is_dead(self, card, team):
-        for card, action, pos in self.iter_moves(card, team):
-            if action != MoveType.DISCARD_DEAD_CARD:
+        # Mirrors _build_moves, but as pure bit tests: a card is dead
+        # when it has neither a removal target nor a placement target.
+        card_class = CARD_CLASSES[card]
+        if card_class in (CardClass.ONE_EYED, CardClass.JOKER):
+            if (self._occupied & ~self._team_chips[team]) & ~self._flipped:
+                return False
+        if card_class is not CardClass.ONE_EYED:
+            if card_class is not CardClass.NORMAL:
+                placeable = PLAYABLE_BITS
+            else:
+                placeable = CARD_BITS[card]
+            if placeable & ~self._occupied:
                 return False
         return True
 
@@ -252,15 +397,17 @@ class Board:
         current_card, current_chip = self.getpos(pos)
         if current_card is CORN:
             raise IllegalMove("Cannot play on the corners.")
-        if card in ONE_EYEDS:
+        card_class = CARD_CLASSES[card]
+        if card_class is CardClass.ONE_EYED:
             raise IllegalMove("One-eyed jacks cannot be used to play a chip.")
         if current_chip:
             raise IllegalMove("There is already a chip here.")
-        if not (card in TWO_EYEDS or card == "JJ") and card != current_card:
+        if card_class is CardClass.NORMAL and card != current_card:
             raise IllegalMove(f"The {card} cannot be played on the {current_card}.")
-        row, column = pos
-        self.chips[row][column] = Chip(team)
-        self.update_sequences()
+        bit = pos_bit(pos)
+        self._team_chips[team] |= bit
+        self._occupied |= bit
+        self.update_sequences(pos, team)
 
     def remove_chip(self, card, pos, team):
         current_card, current_chip = self.getpos(pos)
@@ -271,10 +418,11 @@ class Board:
             raise IllegalMove("You cannot remove chips in a sequence.")
         if current_chip.team is team:
             raise IllegalMove("You cannot remove your own chips.")
-        if card != "JJ" and card not in ONE_EYEDS:
+        if CARD_CLASSES[card] not in (CardClass.ONE_EYED, CardClass.JOKER):
             raise IllegalMove(f"The {card} cannot be used to remove chips.")
-        row, column = pos
-        self.chips[row][column] = None
+        bit = pos_bit(pos)
+        self._team_chips[current_chip.team] &= ~bit
+        self._occupied &= ~bit
 
     def iter_sequences(
         self,
@@ -284,110 +432,147 @@ class Board:
         includes_positions=(),
     ):
         """Iterate thru all possible sequences as sets of positions."""
-
-        def non_corner_extension(seq):
-            for cseq in iter_corner_sequences():
-                if len(seq & cseq) == 4:
-                    return False
-            return True
-
-        def possible(seq):
-            one_eyeds_have = one_eyeds_to_make_possible
-            for pos in seq:
-                card, chip = self.getpos(pos)
-                if chip and chip.team is not exclude_impossible_for_team:
-                    if one_eyeds_have > 0 and not chip.is_flipped():
-                        one_eyeds_have -= 1
-                        continue
-                    return False
-            return True
-
-        def position_filter(seq):
-            for pos in includes_positions:
-                if pos not in seq:
-                    return False
-            return True
-
-        filters = []
-        if exclude_corner_extensions:
-            filters.append(non_corner_extension)
+        key = (
+            exclude_corner_extensions,
+            exclude_impossible_for_team,
+            one_eyeds_to_make_possible,
+            tuple(includes_positions),
+            self._state_key(),
+        )
+        seqs = self._seq_cache.get(key)
+        if seqs is None:
+            if len(self._seq_cache) >= self.CACHE_LIMIT:
+                self._seq_cache.clear()
+            seqs = tuple(
+                self._gen_sequences(
+                    exclude_corner_extensions,
+                    exclude_impossible_for_team,
+                    one_eyeds_to_make_possible,
+                    includes_positions,
+                )
+            )
+            self._seq_cache[key] = seqs
+        return iter(seqs)
+
+    def _gen_sequences(
+        self,
+        exclude_corner_extensions,
+        exclude_impossible_for_team,
+        one_eyeds_to_make_possible,
+        includes_positions,
+    ):
         if exclude_impossible_for_team:
-            filters.append(possible)
+            opponents = self._occupied & ~self._team_chips[exclude_impossible_for_team]
+            opp_flipped = opponents & self._flipped
+            opp_unflipped = opponents & ~self._flipped
+        else:
+            opp_flipped = opp_unflipped = 0
+
+        # Narrow to the precomputed candidate tables, which already
+        # have corner extensions stripped when requested, rather than
+        # filtering every sequence on the board.
+        if exclude_corner_extensions:
+            candidates = NON_EXTENSION_SEQUENCES
+            by_position = NON_EXTENSION_SEQUENCES_BY_POSITION
+        else:
+            candidates = ALL_SEQUENCES
+            by_position = SEQUENCES_BY_POSITION
+        include_bits = 0
         if includes_positions:
-            filters.append(position_filter)
-
-        for seq in iter_all_sequences():
-            for func in filters:
-                if not func(seq):
-                    break
-            else:
-                yield seq
+            for pos in includes_positions:
+                include_bits |= pos_bit(pos)
+            candidates = by_position[next(iter(includes_positions))]
 
-    def update_sequences(self):
-        for seq in self.iter_sequences():
-            winning_team = None
-            for pos in seq:
-                card, chip = self.getpos(pos)
-                if card is CORN:
+        for seq in candidates:
+            bits = SEQUENCE_BITS[seq]
+            if include_bits and bits & include_bits != include_bits:
+                continue
+            if exclude_impossible_for_team:
+                # A sequence is impossible if an opponent chip in it is
+                # flipped, or if it has more unflipped opponent chips
+                # than we have one-eyeds to spend.
+                if bits & opp_flipped:
                     continue
-                if not chip:
-                    break
-                if winning_team and winning_team is not chip.team:
-                    break
-                winning_team = chip.team
-            else:
+                if popcount(bits & opp_unflipped) > one_eyeds_to_make_possible:
+                    continue
+            yield seq
+
+    def update_sequences(self, pos, team):
+        """Flip any sequences completed by the chip just placed at pos.
+
+        A sequence only completes when its final chip goes down, so the
+        handful of sequences through the changed position, for the
+        placing team alone, are the only candidates.
+        """
+        chips = self._team_chips[team]
+        for seq in SEQUENCES_BY_POSITION[pos]:
+            need = SEQUENCE_CHIP_BITS[seq]
+            if chips & need == need:
                 # The sequence has a winner!
-                for pos in seq:
-                    card, chip = self.getpos(pos)
-                    if chip and not chip.is_flipped():
-                        chip.flip()
+                self._flipped |= need
 
     def get_winning_sequences_for_team(self, team):
+        won = self._team_chips[team] & self._flipped
+        if not won:
+            return []
+        # The scan depends only on the team's flipped chips, and the
+        # game loop and every weighting strategy ask again each turn,
+        # so memoize on that bitboard.
+        cached = self._win_cache.get(won)
+        if cached is not None:
+            return cached
         winning_sequences = []
-        for seq in self.iter_sequences():
-            if any(len(w & seq) > 1 for w in winning_sequences):
+        winning_bits = []
+        for seq, need in SEQUENCE_CHIP_BITS.items():
+            if won & need != need:
                 continue
-            for pos in seq:
-                card, chip = self.getpos(pos)
-                if card is CORN:
-                    continue
-                if not chip or chip.team is not team or not chip.is_flipped():
-                    break
-            else:
-                winning_sequences.append(seq)
+            # Two winning sequences may share at most one position
+            # (corners included), per the overlap rule.
+            bits = SEQUENCE_BITS[seq]
+            if any(popcount(w & bits) > 1 for w in winning_bits):
+                continue
+            winning_sequences.append(seq)
+            winning_bits.append(bits)
+        if len(self._win_cache) >= self.CACHE_LIMIT:
+            self._win_cache.clear()
+        self._win_cache[won] = winning_sequences
         return winning_sequences
 
     def __str__(self):
-        output = io.StringIO()
-        output.write("   ")
-        for col in range(10):
-            output.write(f"{col}  ")
-        output.write("\n")
+        parts = [BOARD_HEADER]
         for row in range(10):
-            output.write(f"{row}  ")
+            parts.append(f"{row}  ")
             for col in range(10):
                 card, chip = self.getpos((row, col))
                 if card is CORN:
-                    output.write("%%")
+                    parts.append("%%")
                 elif not chip:
-                    output.write(card)
+                    parts.append(card)
                 else:
                     if chip.is_flipped():
-                        output.write("\033[1m")
-                    output.write(
-                        "\033[{}m".format(
-                            {
-                                TeamColor.BLUE: 34,
-                                TeamColor.GREEN: 32,
-                                TeamColor.RED: 31,
-                            }[chip.team.color]
-                        )
-                    )
-                    output.write(card)
-                    output.write("\033[0m")
-                output.write(" ")
-            output.write("\n")
-        return output.getvalue()
+                        parts.append("\033[1m")
+                    parts.append(chip.team.ansi_prefix)
+                    parts.append(card)
+                    parts.append("\033[0m")
+                parts.append(" ")
+            parts.append("\n")
+        return "".join(parts)
+
+
+# The board layout never changes: index the (exactly two) positions
+# printing each card, and mask the non-corner cells, once at import so
+# move enumeration never scans the grid.
+CARD_POSITIONS = {
+    card: tuple(pos for pos in ALL_POS if Board.positions[pos[0]][pos[1]] == card)
+    for card in set(ALL_CARDS) - ONE_EYEDS - TWO_EYEDS - {"JJ"}
+}
+PLAYABLE_BITS = sum(
+    pos_bit(pos) for pos in ALL_POS if Board.positions[pos[0]][pos[1]] is not CORN
+)
+CARD_BITS = {
+    card: sum(pos_bit(pos) for pos in positions)
+    for card, positions in CARD_POSITIONS.items()
+}
 
 
 class TeamColor(enum.Enum):
@@ -396,9 +581,19 @@ class TeamColor(enum.Enum):
     RED = enum.auto()
 
 
+ANSI_TEAM_COLORS = {
+    TeamColor.BLUE: "\033[34m",
+    TeamColor.GREEN: "\033[32m",
+    TeamColor.RED: "\033[31m",
+}
+
+
 class Team:
     def __init__(self, color):
         self.color = color
+        # Flattened from the color table once, so rendering doesn't do
+        # a dict-of-dict lookup per cell.
+        self.ansi_prefix = ANSI_TEAM_COLORS[color]
         self.players = []
 
     def __str__(self):
@@ -418,14 +613,23 @@ class Player:
         self.strategy = strategy
         self.hand = []
         self.ui = ui
+        self._sorted_hand = None
+        self._sorted_hand_key = None
 
     def __str__(self):
         return f"{self.name} ({self.team})"
 
+    def sorted_hand(self):
+        """Get the hand in display order, resorting only when it changed."""
+        key = tuple(self.hand)
+        if key != self._sorted_hand_key:
+            self._sorted_hand = sort_hand(self.hand)
+            self._sorted_hand_key = key
+        return self._sorted_hand
+
 
 def play_game(teams, ui):
     keep_playing = False
-    sequences = {}
 
     if len(teams) == 2:
         sequences_to_win = 2
@@ -467,18 +671,22 @@ def play_game(teams, ui):
     }[len(players)]
 
     board = Board(teams)
+    sequences = {team: [] for team in teams}
 
     for player in players:
         player.strategy.set_game_parameters(
             player, board, sequences_to_win, cards_in_hand
         )
 
-    # Deal the cards.
-    deck = list(ALL_CARDS)
-    random.shuffle(deck)
+    # Deal the cards.  The deck is never reshuffled, so draw by walking
+    # a cursor down a sampled copy rather than popping (and resizing)
+    # the list.
+    deck = random.sample(ALL_CARDS, len(ALL_CARDS))
+    deck_top = len(deck)
     for player in players:
         for _ in range(cards_in_hand):
-            player.hand.append(deck.pop())
+            deck_top -= 1
+            player.hand.append(deck[deck_top])
 
     for player in itertools.cycle(players):
         while True:
@@ -511,10 +719,15 @@ def play_game(teams, ui):
                     continue
                 notify_player.strategy.notify_move(player, (card, action, pos))
 
-            # See if their team has won.
-            sequences = {
-                team: board.get_winning_sequences_for_team(team) for team in teams
-            }
+            # See if their team has won.  A move can only change the
+            # acting team's winning sequences (flipped chips can't be
+            # removed), so only that entry needs recomputing; the
+            # removed chip's owner is refreshed too for good measure.
+            sequences[player.team] = board.get_winning_sequences_for_team(player.team)
+            if action == MoveType.REMOVE_CHIP:
+                sequences[board_chip.team] = board.get_winning_sequences_for_team(
+                    board_chip.team
+                )
             winning_sequences = sequences[player.team]
 
             if len(winning_sequences) >= sequences_to_win and not keep_playing:
@@ -530,8 +743,9 @@ def play_game(teams, ui):
                     return player.team
                 keep_playing = True
 
-            if deck:
-                card = deck.pop()
+            if deck_top:
+                deck_top -= 1
+                card = deck[deck_top]
                 player.strategy.notify_pickup(card)
                 player.hand.append(card)
 
@@ -0,0 +1,273 @@
+import operator
+import random
+
+from ncseq import game
+
+
+def sequence_completion(seq, board, team):
+    popcount = game.popcount
+    bits = game.SEQUENCE_BITS[seq]
+    team_bits = board.team_chips(team)
+    flipped = board.flipped_chips()
+    opponents = board.occupied() & ~team_bits
+
+    # An opponent chip in a sequence can be removed with a one-eyed,
+    # unless it's already in a sequence.
+    if bits & opponents & flipped:
+        return None, None
+
+    # At most one chip already in a sequence may be shared.
+    shared = bits & team_bits & flipped
+    if shared:
+        if popcount(shared) > 1:
+            return None, None
+        completion = 1 + popcount(bits & team_bits & ~flipped)
+    else:
+        completion = popcount(bits & team_bits)
+
+    completion += popcount(bits & game.CORN_BITS)
+    one_eyeds_required = popcount(bits & opponents)
+    return completion, one_eyeds_required
+
+
+class BaseStrategy:
+    def set_game_parameters(self, player, board, sequences_to_win, cards_per_player):
+        self.player = player
+        self.board = board
+        self.sequences_to_win = sequences_to_win
+        self.cards_per_player = cards_per_player
+        self.opponent_teams = tuple(
+            team for team in board.teams if team is not player.team
+        )
+
+    def notify_move(self, player, move):
+        pass
+
+    def notify_pickup(self, card):
+        pass
+
+    def query_move(self):
+        raise NotImplementedError
+
+
+class RandomStrategy(BaseStrategy):
+    def query_move(self):
+        moves = [
+            move
+            for card in self.player.hand
+            for move in self.board.iter_moves(card, self.player.team)
+        ]
+        return random.choice(moves)
+
+
+class HumanStrategy(BaseStrategy):
+    def notify_pickup(self, card):
+        self.player.ui.notify_pickup(self.player, card)
+
+    def query_move(self):
+        return self.player.ui.query_move(self.player, self.board)
+
+
+class WeightedBaseStrategy(BaseStrategy):
+    # A weight at or above this bound cannot be beaten; query_move
+    # stops scanning candidates once it sees one.
+    UNBEATABLE_WEIGHT = None
+
+    def _start_turn(self):
+        """Hook to compute per-turn state before moves are weighted."""
+
+    def move_weight(self, move):
+        raise NotImplementedError
+
+    def query_move(self):
+        self._start_turn()
+        move_weight = self.move_weight
+        iter_moves = self.board.iter_moves
+        team = self.player.team
+        unbeatable = self.UNBEATABLE_WEIGHT
+        best_weight = None
+        best_move = None
+        for card in game.unique_cards_by_action(self.player.hand):
+            for move in iter_moves(card, team):
+                weight = move_weight(move)
+                if best_weight is None or weight > best_weight:
+                    best_weight = weight
+                    best_move = move
+                    if unbeatable is not None and weight >= unbeatable:
+                        return best_move
+        return best_move
+
+
+class CentermostStrategy(WeightedBaseStrategy):
+    UNBEATABLE_WEIGHT = 9999
+
+    def move_weight(self, move):
+        return game.move_weight_centermost(move)
+
+
+class SimpleWeightingStrategy(WeightedBaseStrategy):
+    DEFAULT_OFFENSE_MULTIPLIERS = (1, 1.1, 2, 4, 10)
+    DEFAULT_DEFENSE_MULTIPLIERS = (0.1, 0.15, 0.5, 1.5, 5)
+
+    # Only a dead-card discard weighs this much; a discard is a free
+    # action, so nothing can beat it.
+    UNBEATABLE_WEIGHT = 9999 * 9999
+
+    def __init__(
+        self,
+        offense_multipliers=None,
+        defense_multipliers=None,
+        debug_moves=False,
+        two_eyed_non_completion_multiplier=0.5,
+        two_eyed_multiplier=0.9,
+        joker_multiplier=0.8,
+    ):
+        self.offense_multipliers = (
+            offense_multipliers or self.DEFAULT_OFFENSE_MULTIPLIERS
+        )
+        self.defense_multipliers = (
+            defense_multipliers or self.DEFAULT_DEFENSE_MULTIPLIERS
+        )
+        self.debug_moves = debug_moves
+        self.two_eyed_non_completion_multiplier = two_eyed_non_completion_multiplier
+        self.two_eyed_multiplier = two_eyed_multiplier
+        self.joker_multiplier = joker_multiplier
+        self.cards_played = []
+        # Weight buffers reused across move evaluations; _move_weights
+        # zeroes them in place rather than allocating per move.
+        self._offense_buf = [0] * 5
+        self._defense_buf = [0] * 5
+
+    def _start_turn(self):
+        # The hand can't change while we weigh moves, so count our
+        # one-eyeds once per turn rather than once per candidate move.
+        self._num_one_eyeds = sum(
+            1
+            for card in self.player.hand
+            if game.CARD_CLASSES[card]
+            in (game.CardClass.ONE_EYED, game.CardClass.JOKER)
+        )
+        # Many candidate positions share sequences, and the board
+        # doesn't mutate mid-turn, so completions are memoized for the
+        # duration of the turn.
+        self._completion_cache = {}
+        # Moves for different cards share (move type, position) pairs
+        # (wild placements, both jacks of a kind), and the weights only
+        # depend on that pair, so they're memoized per turn too.
+        self._move_weights_cache = {}
+        self._existing_wins = len(
+            self.board.get_winning_sequences_for_team(self.player.team)
+        )
+
+    def _sequence_completion(self, seq, team):
+        key = (seq, team)
+        result = self._completion_cache.get(key)
+        if result is None:
+            result = sequence_completion(seq, self.board, team)
+            self._completion_cache[key] = result
+        return result
+
+    def _move_weights(self, move):
+        card, move_type, pos = move
+        key = (move_type, pos)
+        cached = self._move_weights_cache.get(key)
+        if cached is not None:
+            return cached
+        num_one_eyeds = self._num_one_eyeds
+        offense_values = self._offense_buf
+        defense_values = self._defense_buf
+        offense_values[:] = (0, 0, 0, 0, 0)
+        defense_values[:] = (0, 0, 0, 0, 0)
+
+        if move_type == game.MoveType.REMOVE_CHIP:
+            _, board_chip = self.board.getpos(pos)
+            removed_team = board_chip.team
+        else:
+            removed_team = None
+
+        # This iter_sequences query applies no board-dependent filters,
+        # so it's just the static geometry table; index it directly.
+        for seq in game.NON_EXTENSION_SEQUENCES_BY_POSITION[pos]:
+            # Offense.
+            completion, one_eyeds_required = self._sequence_completion(
+                seq, self.player.team
+            )
+
+            if completion is not None and one_eyeds_required <= num_one_eyeds:
+                # If we are removing a chip, we can consider this to be
+                # an offensive move for completing a sequence.  The
+                # "completion" is going to be reduced by the number of
+                # one-eyeds required, as at least N more turns will be
+                # required to complete the sequence.
+                if move_type != game.MoveType.REMOVE_CHIP:
+                    offense_values[completion] += 1
+                elif one_eyeds_required <= completion:
+                    offense_values[completion - one_eyeds_required] += 1
+
+            # Defense.
+            for team in self.opponent_teams:
+                completion, one_eyeds_required = self._sequence_completion(seq, team)
+
+                if completion is None:
+                    continue
+                if one_eyeds_required >= 2:
+                    continue
+
+                if move_type == game.MoveType.PLACE_CHIP:
+                    # Placing a chip is essentially a full-blockage of
+                    # a sequence.  Count it as a total defense point.
+                    dvalue = 1
+                else:
+                    # Removing a chip only counts if we are removing
+                    # this team's chip.
+                    if removed_team is not team:
+                        continue
+                    dvalue = 0.75
+                if one_eyeds_required:
+                    dvalue *= 0.25
+                defense_values[completion] += dvalue
+
+        if self.debug_moves:
+            print(f"  OFFENSE={offense_values}")
+            print(f"  DEFENSE={defense_values}")
+
+        result = (tuple(offense_values), tuple(defense_values))
+        self._move_weights_cache[key] = result
+        return result
+
+    def move_weight(self, move):
+        card, move_type, pos = move
+        card_class = game.CARD_CLASSES[card]
+
+        # Always discard dead cards.
+        if move_type == game.MoveType.DISCARD_DEAD_CARD:
+            if card_class is game.CardClass.ONE_EYED:
+                return 0
+            return 9999 * 9999
+
+        if self.debug_moves:
+            print(f"Play {move}:")
+        offense_weights, defense_weights = self._move_weights(move)
+        weight = sum(
+            map(operator.mul, offense_weights, self.offense_multipliers)
+        ) + sum(map(operator.mul, defense_weights, self.defense_multipliers))
+
+        if card_class is game.CardClass.JOKER:
+            # Discourage spending joker if possible.
+            weight *= self.joker_multiplier
+        elif card_class is game.CardClass.TWO_EYED:
+            # Discourage playing a two-eyed jack over a regular card.
+            weight *= self.two_eyed_multiplier
+
+        # Prefer two-eyeds only for completing sequences.
+        if (
+            card_class in (game.CardClass.TWO_EYED, game.CardClass.JOKER)
+            and offense_weights[4] == 0
+        ):
+            weight *= self.two_eyed_non_completion_multiplier
+
+        # Always prefer winning.
+        if self._existing_wins + offense_weights[4] >= self.sequences_to_win:
+            weight *= 9999
+
+        return weight
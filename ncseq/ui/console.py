@@ -39,14 +39,15 @@ class ConsoleUI:
         self._log_message(f"[{player}] You picked up the {card}.")
 
     def query_move(self, player, board):
-        hand = game.sort_hand(player.hand)
+        hand = player.sorted_hand()
+        hand_set = set(hand)
         while True:
             card = input(f"[{player}] Which card to play ({', '.join(hand)})? ")
             card = card.upper().strip()
-            if card not in player.hand:
+            if card not in hand_set:
                 self._log_message("That card is not in your hand!")
                 continue
-            moves = list(board.iter_moves(card, player.team))
+            moves = board.iter_moves(card, player.team)
 
             prompt = "How do you want to play it?\n\n"
             for i, move in enumerate(moves):
@@ -1,18 +1,86 @@
+import collections
 import curses
-import functools
+import itertools
 
 from ncseq import game
 from ncseq.ui import console
 
 
-def manhattan_dist(a, b):
-    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+DIRECTION_VECTORS = {
+    curses.KEY_UP: (-1, 0),
+    curses.KEY_DOWN: (1, 0),
+    curses.KEY_LEFT: (0, -1),
+    curses.KEY_RIGHT: (0, 1),
+}
+
+# Pairwise Manhattan distances between board positions, indexed by
+# (r1 * 10 + c1) * 100 + r2 * 10 + c2; one load per candidate on the
+# arrow-key path instead of unpacking and two abs() calls.
+MANHATTAN_DISTS = tuple(
+    abs(r1 - r2) + abs(c1 - c2)
+    for r1 in range(10)
+    for c1 in range(10)
+    for r2 in range(10)
+    for c2 in range(10)
+)
+
+
+# Card glyphs and foreground colors never change, so compute them once
+# rather than per cell per frame in _draw_card.
+CARD_LABELS = {
+    card: f"{game.pretty_card(card):>3}"[:3].upper() for card in set(game.ALL_CARDS)
+}
+CARD_LABELS[game.CORN] = "   "
+CARD_FG_COLORS = {
+    card: curses.COLOR_RED if card[-1] in ("H", "D") else curses.COLOR_BLACK
+    for card in set(game.ALL_CARDS)
+}
+CARD_FG_COLORS[game.CORN] = curses.COLOR_BLACK
+
+TEAM_CHIP_COLORS = {
+    game.TeamColor.BLUE: curses.COLOR_BLUE,
+    game.TeamColor.GREEN: curses.COLOR_GREEN,
+    game.TeamColor.RED: curses.COLOR_RED,
+}
+
+
+def _card_render_record(card):
+    if card in game.TWO_EYEDS:
+        fixed_chip = "‥"
+    elif card in game.ONE_EYEDS:
+        fixed_chip = "."
+    else:
+        fixed_chip = ""
+    return (CARD_LABELS[card], CARD_FG_COLORS[card], fixed_chip, card is game.CORN)
+
+
+# One record per card resolving the membership-test branch chain
+# _draw_card used to walk for every cell of every frame.
+CARD_RENDER = {
+    card: _card_render_record(card) for card in set(game.ALL_CARDS) | {game.CORN}
+}
+
+# Every (fg, bg) combination the interface ever draws with.
+UI_COLORS = (
+    curses.COLOR_BLACK,
+    curses.COLOR_WHITE,
+    curses.COLOR_RED,
+    curses.COLOR_BLUE,
+    curses.COLOR_GREEN,
+    curses.COLOR_YELLOW,
+    curses.COLOR_CYAN,
+)
 
 
 class TUI(console.ConsoleUI):
     def __init__(self):
         self.screen = curses.initscr()
         self.screen.keypad(True)
+        # Input is strictly blocking: there's no animation, so the
+        # process should burn zero CPU while waiting for a key.  Keep
+        # it that way; a nodelay/halfdelay poll loop would repaint at
+        # the poll rate for nothing.
+        self.screen.timeout(-1)
         curses.start_color()
         curses.use_default_colors()
         curses.noecho()
@@ -20,7 +88,7 @@ class TUI(console.ConsoleUI):
         curses.curs_set(False)
         curses.mousemask(curses.BUTTON1_CLICKED)
 
-        self._loglines = []
+        self._loglines = collections.deque(maxlen=10000)
         self._player = None
         self._board = None
         self._board_caption = ""
@@ -32,14 +100,31 @@ class TUI(console.ConsoleUI):
         self._new_card = None
         self._discard = None
         self._movelist = []
-        self._hinted_positions = []
+        self._hinted_positions = frozenset()
         self._move = None
         self._turn_display = ""
         self._color_pairs = {}
+        # Prime every color pair up front so _draw_card never hits the
+        # init_pair cold path mid-frame, and flatten the attrs into a
+        # 64-slot table indexed fg * 8 + bg so the per-cell path is one
+        # list index instead of a dict probe plus color_pair call.
+        self._cp = [0] * 64
+        for fg in UI_COLORS:
+            for bg in UI_COLORS:
+                self._cp[fg * 8 + bg] = self._color_pair(fg, bg)
         self._dead_card = None
         self._dead_card_discard = True
         self._alert = None
         self._mousemap = []
+        self._card_space = 3
+        self._board_space = 31
+        self._cell_cache = {}
+        self._last_screen_size = None
+        self._last_side_state = None
+        self._last_log = None
+        self._last_fingerprint = None
+        self._needs_full_redraw = True
+        self._dirty = True
 
         # Default background/foreground
         self._background = self._color_pair(curses.COLOR_WHITE, curses.COLOR_GREEN)
@@ -52,13 +137,33 @@ class TUI(console.ConsoleUI):
         curses.endwin()
         curses.curs_set(True)
 
+    def _request_redraw(self):
+        """Mark the screen stale; _getch repaints once before blocking.
+
+        Bursts of state changes between keystrokes (several log lines,
+        a turn banner plus a board update) then cost one repaint rather
+        than one each.
+        """
+        self._dirty = True
+
     def _getch(self):
-        key = self.screen.getch()
+        if self._dirty:
+            # Drain queued input before repainting: when key-repeat
+            # outruns rendering, the intermediate frames are never
+            # drawn and the final state paints once the queue empties.
+            self.screen.nodelay(True)
+            key = self.screen.getch()
+            self.screen.nodelay(False)
+            if key == -1:
+                self._redraw()
+                key = self.screen.getch()
+        else:
+            key = self.screen.getch()
         if key in (10, 13):
             key = curses.KEY_ENTER
         if key == ord("i") or key == ord("I"):
             self._invert_board = not self._invert_board
-            self._redraw()
+            self._request_redraw()
         if key == curses.KEY_MOUSE:
             try:
                 _, x, y, _, state = curses.getmouse()
@@ -80,11 +185,11 @@ class TUI(console.ConsoleUI):
 
     def _log_message(self, message):
         self._loglines.append(message)
-        self._redraw()
+        self._request_redraw()
 
     def _do_alert(self, message, buttons=("OK",)):
         self._alert = (message, buttons, 0)
-        self._redraw()
+        self._request_redraw()
         while self._alert:
             key = self._getch()
             message, buttons, i = self._alert
@@ -93,10 +198,10 @@ class TUI(console.ConsoleUI):
                 return buttons[i]
             if key == curses.KEY_LEFT:
                 self._alert = (message, buttons, (i - 1) % len(buttons))
-                self._redraw()
+                self._request_redraw()
             elif key == curses.KEY_RIGHT:
                 self._alert = (message, buttons, (i + 1) % len(buttons))
-                self._redraw()
+                self._request_redraw()
 
     def update_board(self, board):
         self._board = board
@@ -104,7 +209,7 @@ class TUI(console.ConsoleUI):
 
     def notify_turn(self, player):
         self._turn_display = f"{player}'s turn"
-        self._redraw()
+        self._request_redraw()
 
     def notify_pickup(self, player, card):
         self._new_card = card
@@ -142,13 +247,13 @@ class TUI(console.ConsoleUI):
             ["Exit"],
         )
 
-    def _hand_click_handler(self, y, x, state, x_start, card_space):
+    def _hand_click_handler(self, y, x, state):
         if not (3 <= y <= 5):
             return
-        x -= x_start
+        x -= self._board_space + 1
         if x < 0:
             return
-        idx = x // card_space
+        idx = x // self._card_space
         if idx >= len(self._hand):
             return
         self._hand_ptr = idx
@@ -159,21 +264,27 @@ class TUI(console.ConsoleUI):
             # Mouse event selected a new card already.
             selected_card = self._hand[self._hand_ptr]
             self._hand_ptr = -1
-            self._hinted_positions = []
+            self._hinted_positions = frozenset()
             return selected_card
 
         self._hand_line = "Choose a card from your hand to play:"
         self._hand_ptr = 0
         self._movelist = []
 
+        # The board can't change during card selection, so each card's
+        # hints are computed at most once however many times the cursor
+        # passes over it.
+        hint_cache = {}
         while True:
-            self._hinted_positions = [
-                pos
-                for _, _, pos in self._board.iter_moves(
-                    self._hand[self._hand_ptr], player.team
+            card = self._hand[self._hand_ptr]
+            hints = hint_cache.get(card)
+            if hints is None:
+                hints = frozenset(
+                    pos for _, _, pos in self._board.iter_moves(card, player.team)
                 )
-            ]
-            self._redraw()
+                hint_cache[card] = hints
+            self._hinted_positions = hints
+            self._request_redraw()
             key = self._getch()
             if key == curses.KEY_LEFT:
                 self._hand_ptr = (self._hand_ptr - 1) % len(self._hand)
@@ -182,7 +293,7 @@ class TUI(console.ConsoleUI):
             elif key == curses.KEY_ENTER:
                 selected_card = self._hand[self._hand_ptr]
                 self._hand_ptr = -1
-                self._hinted_positions = []
+                self._hinted_positions = frozenset()
                 return selected_card
 
     def _next_move_from_keypress(self, key):
@@ -206,29 +317,34 @@ class TUI(console.ConsoleUI):
             idx %= len(self._movelist)
             return self._movelist[idx]
 
-        qualfunc = {
-            curses.KEY_UP: lambda r, c: r < cur_row,
-            curses.KEY_DOWN: lambda r, c: r > cur_row,
-            curses.KEY_LEFT: lambda r, c: c < cur_col,
-            curses.KEY_RIGHT: lambda r, c: c > cur_col,
-        }.get(key, lambda r, c: False)
-
-        qual_moves = [m for m in self._movelist if qualfunc(m[2][0], m[2][1])]
-        if not qual_moves:
+        vec = DIRECTION_VECTORS.get(key)
+        if vec is None:
             return self._move
-
-        # Prefer moves which are in the same row or column.
-        qual_moves_sharing_dimen = [
-            m for m in qual_moves if m[2][0] == cur_row or m[2][1] == cur_col
-        ]
-        if qual_moves_sharing_dimen:
-            qual_moves = qual_moves_sharing_dimen
-
-        return min(qual_moves, key=lambda move: manhattan_dist(move[2], cur_pos))
-
-    def _board_click_handler(self, y, x, state, card_space):
-        row = y // card_space
-        column = x // card_space
+        vr, vc = vec
+
+        # One pass: qualify by direction, preferring moves in the same
+        # row or column, then by distance.
+        cur_idx = (cur_row * 10 + cur_col) * 100
+        best = self._move
+        best_rank = None
+        for move in self._movelist:
+            row, col = move[2]
+            dr = row - cur_row
+            dc = col - cur_col
+            if dr * vr + dc * vc <= 0:
+                continue
+            rank = (
+                dr != 0 and dc != 0,
+                MANHATTAN_DISTS[cur_idx + row * 10 + col],
+            )
+            if best_rank is None or rank < best_rank:
+                best_rank = rank
+                best = move
+        return best
+
+    def _board_click_handler(self, y, x, state):
+        row = y // self._card_space
+        column = x // self._card_space
         if self._invert_board:
             row = 9 - row
             column = 9 - column
@@ -241,13 +357,13 @@ class TUI(console.ConsoleUI):
     def query_move(self, player, board):
         self._player = player
         self._board = board
-        self._hand = game.sort_hand(player.hand)
+        self._hand = player.sorted_hand()
         self._board_clicked_pos = None
 
         while True:
             chosen_card = self._choose_card(player)
 
-            self._movelist = list(self._board.iter_moves(chosen_card, player.team))
+            self._movelist = self._board.iter_moves(chosen_card, player.team)
             if len(self._movelist) == 1:
                 _, action, _ = self._movelist[0]
                 if action == game.MoveType.DISCARD_DEAD_CARD:
@@ -257,7 +373,7 @@ class TUI(console.ConsoleUI):
                         continue
 
             self._hand_line = "Your Hand:  (Press Esc to choose another card)"
-            self._hinted_positions = [pos for _, _, pos in self._movelist]
+            self._hinted_positions = frozenset(pos for _, _, pos in self._movelist)
             self._move = max(self._movelist, key=game.move_weight_centermost)
 
             while True:
@@ -271,14 +387,14 @@ class TUI(console.ConsoleUI):
                     self._board_clicked_pos = None
                     assert len(moves) == 1
                     self._movelist = []
-                    self._hinted_positions = []
+                    self._hinted_positions = frozenset()
                     self._board_caption = ""
                     return moves[0]
                 move_desc = game.describe_move(self._move, self._board)
                 self._board_caption = (
                     f"Press Enter to {move_desc[0].lower()}{move_desc[1:]}"
                 )
-                self._redraw()
+                self._request_redraw()
                 key = self._getch()
                 if self._board_clicked_pos:
                     continue
@@ -291,7 +407,7 @@ class TUI(console.ConsoleUI):
                 if key == curses.KEY_ENTER:
                     move = self._move
                     self._movelist = []
-                    self._hinted_positions = []
+                    self._hinted_positions = frozenset()
                     self._board_caption = ""
                     self._hand_line = "Your Hand:"
                     self._move = None
@@ -302,7 +418,7 @@ class TUI(console.ConsoleUI):
         self._dead_card = card
 
         while self._dead_card:
-            self._redraw()
+            self._request_redraw()
             key = self._getch()
             if key == curses.KEY_ENTER:
                 self._dead_card = None
@@ -329,42 +445,27 @@ class TUI(console.ConsoleUI):
         if selected:
             bg_color = curses.COLOR_CYAN
 
-        fg_color = (
-            curses.COLOR_RED
-            if card is not game.CORN and card[-1] in ("H", "D")
-            else curses.COLOR_BLACK
-        )
-        chip_fg_color = curses.COLOR_WHITE
-
-        if chip:
-            chip_color = {
-                game.TeamColor.BLUE: curses.COLOR_BLUE,
-                game.TeamColor.GREEN: curses.COLOR_GREEN,
-                game.TeamColor.RED: curses.COLOR_RED,
-            }[chip.team.color]
-        else:
-            chip_color = bg_color
+        card_label, fg_color, fixed_chip, is_corner = CARD_RENDER[card]
 
-        if card is game.CORN:
-            chip_color = curses.COLOR_BLACK
-            card_label = "   "
-        else:
-            card_label = f"{game.pretty_card(card):>3}"[:3].upper()
-
-        if card in game.TWO_EYEDS:
-            chip_chr = "‥"
+        if fixed_chip:
+            # Jacks: the eye glyph sits on the card background.
+            chip_chr = fixed_chip
             chip_color = bg_color
             chip_fg_color = curses.COLOR_BLACK
-        elif card in game.ONE_EYEDS:
-            chip_chr = "."
-            chip_color = bg_color
-            chip_fg_color = curses.COLOR_BLACK
-        elif chip and chip.is_flipped():
-            chip_chr = "@"
-        elif chip or card is game.CORN:
-            chip_chr = " "
         else:
-            chip_chr = ""
+            chip_fg_color = curses.COLOR_WHITE
+            if is_corner:
+                chip_color = curses.COLOR_BLACK
+            elif chip:
+                chip_color = TEAM_CHIP_COLORS[chip.team.color]
+            else:
+                chip_color = bg_color
+            if chip and chip.is_flipped():
+                chip_chr = "@"
+            elif chip or is_corner:
+                chip_chr = " "
+            else:
+                chip_chr = ""
 
         base_attr = 0
         if new or dead:
@@ -376,33 +477,41 @@ class TUI(console.ConsoleUI):
         if dead:
             bottom_line = " ☠ "
 
-        self.screen.addstr(
-            y, x, card_label, base_attr | self._color_pair(fg_color, bg_color)
-        )
-        self.screen.addstr(
-            y + 1, x, "   ", base_attr | self._color_pair(fg_color, bg_color)
-        )
+        card_attr = base_attr | self._cp[fg_color * 8 + bg_color]
+        self.screen.addstr(y, x, card_label, card_attr)
+        self.screen.addstr(y + 1, x, "   ", card_attr)
         if chip_chr:
             self.screen.addstr(
                 y + 1,
                 x + 1,
                 chip_chr,
-                base_attr | self._color_pair(chip_fg_color, chip_color),
+                base_attr | self._cp[chip_fg_color * 8 + chip_color],
             )
-        self.screen.addstr(
-            y + 2,
-            x,
-            bottom_line,
-            base_attr | self._color_pair(fg_color, bg_color),
-        )
+        self.screen.addstr(y + 2, x, bottom_line, card_attr)
+
+    def _draw_card_bg(self, y, x, card):
+        """Fast path for a bare board cell.
+
+        No chip, hint, selection, or badge means all three rows share
+        one precomputed attr and there is nothing to branch on.
+        """
+        card_label, fg_color, _, _ = CARD_RENDER[card]
+        attr = self._cp[fg_color * 8 + curses.COLOR_WHITE]
+        self.screen.addstr(y, x, card_label, attr)
+        self.screen.addstr(y + 1, x, "   ", attr)
+        self.screen.addstr(y + 2, x, "   ", attr)
 
     def _fill(self, y, x, height, width, bg_color, shadow=False):
         if shadow:
-            self._fill(y + 1, x + 1, height, width, curses.COLOR_BLACK)
+            # The fill painted next covers all but the right and bottom
+            # edges of the offset shadow rectangle, so stroke just those
+            # two edges rather than filling and overdrawing it.
+            dark = ord(" ") | self._cp[curses.COLOR_BLACK * 8 + curses.COLOR_BLACK]
+            self.screen.vline(y + 1, x + width, dark, height)
+            self.screen.hline(y + height, x + 1, dark, width)
+        blank = ord(" ") | self._cp[bg_color * 8 + bg_color]
         for i in range(height):
-            self.screen.addstr(
-                y + i, x, " " * width, self._color_pair(bg_color, bg_color)
-            )
+            self.screen.hline(y + i, x, blank, width)
 
     def _button(
         self,
@@ -428,31 +537,106 @@ class TUI(console.ConsoleUI):
             self._mousemap.append(mouse_handler)
 
     def _redraw(self):
-        self._mousemap = []
+        self._dirty = False
         screen_lines, screen_columns = self.screen.getmaxyx()
-        self._fill(0, 0, screen_lines - 1, screen_columns, curses.COLOR_GREEN)
+        # Everything the frame is drawn from; when none of it changed
+        # (e.g. an ignored keystroke requested a repaint), skip the
+        # frame outright.
+        fingerprint = (
+            screen_lines,
+            screen_columns,
+            self._board and self._board._state_key(),
+            tuple(self._hand or ()),
+            self._hand_ptr,
+            self._new_card,
+            self._discard,
+            self._invert_board,
+            self._turn_display,
+            self._hand_line,
+            self._board_caption,
+            self._move,
+            self._hinted_positions,
+            len(self._loglines),
+            self._alert,
+            self._dead_card,
+            self._dead_card_discard,
+        )
+        if fingerprint == self._last_fingerprint and not self._needs_full_redraw:
+            return
+        self._last_fingerprint = fingerprint
+        self._mousemap = []
+        modal = bool(self._dead_card or self._alert)
+        # State drawn outside the board grid which is not self-clearing:
+        # any change here forces a full repaint.  Everything else (the
+        # board cells) is diffed per cell below.
+        side_state = (
+            tuple(self._hand or ()),
+            self._new_card,
+            self._discard,
+            self._invert_board,
+            self._turn_display,
+            self._hand_line,
+        )
+        full_redraw = (
+            self._needs_full_redraw
+            or modal
+            or (screen_lines, screen_columns) != self._last_screen_size
+            or side_state != self._last_side_state
+        )
+        self._last_screen_size = (screen_lines, screen_columns)
+        self._last_side_state = side_state
+        # Modals overlap the board, so the frame after one goes away
+        # must repaint everything too.
+        self._needs_full_redraw = modal
+        if full_redraw:
+            self._cell_cache.clear()
+            self._fill(0, 0, screen_lines - 1, screen_columns, curses.COLOR_GREEN)
         if screen_lines > 50 and screen_columns > 100:
             card_space = 4
         else:
             card_space = 3
         board_space = (card_space * 10) + 1
+        # The click handlers are bound methods reading the geometry
+        # from these attributes, so no per-frame closures are needed.
+        self._card_space = card_space
+        self._board_space = board_space
 
         if self._board:
             selected_pos = self._move[2] if self._move else None
-            for pos in game.iter_pos():
+            for pos in game.ALL_POS:
                 card, chip = self._board.getpos(pos)
+                selected = pos == selected_pos
+                hinted = pos in self._hinted_positions
+                cell_state = (
+                    chip.team if chip else None,
+                    chip.is_flipped() if chip else False,
+                    selected,
+                    hinted,
+                )
+                if self._cell_cache.get(pos) == cell_state:
+                    continue
+                self._cell_cache[pos] = cell_state
                 row, col = pos
                 if self._invert_board:
                     row = 9 - row
                     col = 9 - col
-                self._draw_card(
-                    row * card_space,
-                    col * card_space,
-                    card,
-                    chip=chip,
-                    selected=pos == selected_pos,
-                    hinted=pos in self._hinted_positions,
+                bare = (
+                    chip is None
+                    and not selected
+                    and not hinted
+                    and card is not game.CORN
                 )
+                if bare:
+                    self._draw_card_bg(row * card_space, col * card_space, card)
+                else:
+                    self._draw_card(
+                        row * card_space,
+                        col * card_space,
+                        card,
+                        chip=chip,
+                        selected=selected,
+                        hinted=hinted,
+                    )
             self.screen.addstr(
                 board_space - 1,
                 0,
@@ -461,12 +645,7 @@ class TUI(console.ConsoleUI):
             )
 
         if self._hinted_positions:
-            self._mousemap.append(
-                functools.partial(
-                    self._board_click_handler,
-                    card_space=card_space,
-                ),
-            )
+            self._mousemap.append(self._board_click_handler)
 
         if self._hand:
             self.screen.addstr(2, board_space + 1, self._hand_line)
@@ -485,13 +664,7 @@ class TUI(console.ConsoleUI):
                     new=new,
                     dead=self._board.card_is_dead(card, self._player.team),
                 )
-                self._mousemap.append(
-                    functools.partial(
-                        self._hand_click_handler,
-                        x_start=board_space + 1,
-                        card_space=card_space,
-                    ),
-                )
+            self._mousemap.append(self._hand_click_handler)
 
         if self._discard:
             self.screen.addstr(7, board_space + 1, "Discard")
@@ -501,17 +674,29 @@ class TUI(console.ConsoleUI):
             0, board_space + 1, self._turn_display, curses.A_BOLD | self._background
         )
 
-        disp_log = self._loglines[-(screen_lines - board_space - 1) :]
-        while len(disp_log) < (screen_lines - board_space - 1):
-            disp_log.append("")
-
-        for i, line in enumerate(disp_log):
-            self.screen.addstr(
-                board_space + i,
-                0,
-                line.ljust(screen_columns),
-                self._color_pair(curses.COLOR_BLACK, curses.COLOR_WHITE),
+        log_window = screen_lines - board_space - 1
+        disp_log = list(
+            itertools.islice(
+                self._loglines, max(0, len(self._loglines) - log_window), None
             )
+        )
+        # The log pane only changes when a line arrives or scrolls, so
+        # skip rewriting it when the window contents are unchanged.
+        if full_redraw or disp_log != self._last_log:
+            log_attr = self._cp[curses.COLOR_BLACK * 8 + curses.COLOR_WHITE]
+            for i, line in enumerate(disp_log):
+                self.screen.addstr(
+                    board_space + i,
+                    0,
+                    line.ljust(screen_columns),
+                    log_attr,
+                )
+            # Rows the log hasn't filled yet get a C-level blank fill
+            # rather than width-sized pad strings.
+            blank = ord(" ") | log_attr
+            for i in range(len(disp_log), log_window):
+                self.screen.hline(board_space + i, 0, blank, screen_columns)
+        self._last_log = disp_log
 
         if self._dead_card:
             self._mousemap = []
@@ -597,7 +782,7 @@ class TUI(console.ConsoleUI):
                     x_pos,
                     btn,
                     bg_color=curses.COLOR_CYAN if i == ptr else curses.COLOR_WHITE,
-                    on_click=functools.partial(on_click_alert_button, i),
+                    on_click=lambda i=i: on_click_alert_button(i),
                 )
 
         self.screen.refresh()